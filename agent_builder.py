@@ -5,7 +5,9 @@ from dotenv import load_dotenv
 from langchain_openai import ChatOpenAI
 from langgraph.prebuilt import create_react_agent
 from langgraph.checkpoint.memory import InMemorySaver
+from langchain_core.messages import SystemMessage
 from langchain_core.tools import tool
+from langchain_core.utils.function_calling import convert_to_openai_tool
 
 load_dotenv()
 
@@ -16,10 +18,25 @@ GLOBAL_MEMORY = InMemorySaver()
 NODE_API_BASE = os.getenv("NODE_API_BASE", "http://localhost:3001")
 
 
+def canonical_context(context: str) -> str:
+    """Normalize the tenant context so the system prompt is byte-identical on every call.
+    Unifies line endings and strips trailing whitespace, which would otherwise break
+    the provider's prompt prefix cache.
+    """
+    lines = context.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+    return "\n".join(line.rstrip() for line in lines).strip()
+
+
+def canonical_tools(tools):
+    """Return tool configs in a deterministic order (by name) regardless of request order."""
+    return sorted(tools, key=lambda tc: tc.name)
+
+
 def build_tools(tools):
     langgraph_tools = []
 
-    for tool_config in tools:
+    # Sort tools so the tool definitions sent to the provider are stable across requests
+    for tool_config in canonical_tools(tools):
         # Check if it's HTTP tool (has endpoint) or function tool (has parameters)
         if tool_config.endpoint:
             # HTTP Tool (existing logic)
@@ -87,20 +104,35 @@ def build_tools(tools):
     return langgraph_tools
 
 
-def build_dynamic_agent(context: str, tools):
+def build_prompt_prefix(context: str, tools):
+    """Return the static part of the prompt (system message + tool definitions) as sent to the provider.
+    Useful for checking that the cacheable prefix does not change between calls.
+    """
+    return {
+        "system": canonical_context(context),
+        "tools": [convert_to_openai_tool(t) for t in build_tools(tools)],
+    }
+
+
+def build_dynamic_agent(context: str, tools, llm=None):
     # Create LLM for reasoning
-    llm = ChatOpenAI(
-        model="gpt-4o-mini",
-        temperature=0.2
-    )
+    if llm is None:
+        llm = ChatOpenAI(
+            model="gpt-4o-mini",
+            temperature=0.2
+        )
 
     # Create tool wrappers
     tool_list = build_tools(tools)
 
-    # Create dynamic agent using LangGraph ReAct template with GLOBAL memory
+    # Create dynamic agent using LangGraph ReAct template with GLOBAL memory.
+    # The system context is injected as the prompt on every model call instead of
+    # being stored in thread memory, so the prefix (system + tools) stays identical
+    # across turns and can be served from the provider's prompt cache.
     agent = create_react_agent(
         model=llm,
         tools=tool_list,
+        prompt=SystemMessage(content=canonical_context(context)),
         checkpointer=GLOBAL_MEMORY,
     )
 
@@ -61,6 +61,40 @@ def extract_token_usage_from_result(result):
     return None
 
 
+def extract_cached_tokens_from_result(result):
+    """Extract the number of prompt tokens served from the provider's prompt cache.
+    Looks for token_usage.prompt_tokens_details.cached_tokens (OpenAI) and
+    usage_metadata.input_token_details.cache_read (LangChain).
+    Returns an int or None if not found.
+    """
+    messages = None
+    if isinstance(result, dict):
+        messages = result.get("messages", [])
+    else:
+        messages = getattr(result, "messages", []) or []
+
+    if not messages:
+        return None
+
+    last = messages[-1]
+    for attr in ("response_metadata", "additional_kwargs", "usage_metadata"):
+        if isinstance(last, dict):
+            attrv = last.get(attr)
+        else:
+            attrv = getattr(last, attr, None)
+        if not isinstance(attrv, dict):
+            continue
+        usage = attrv.get("token_usage")
+        if isinstance(usage, dict):
+            details = usage.get("prompt_tokens_details") or {}
+            if isinstance(details, dict) and details.get("cached_tokens") is not None:
+                return details["cached_tokens"]
+        details = attrv.get("input_token_details")
+        if isinstance(details, dict) and details.get("cache_read") is not None:
+            return details["cache_read"]
+    return None
+
+
 def extract_model_name_from_result(result):
     """Extract model name from a LangGraph agent result.
     Looks for common locations like response_metadata.model_name or top-level model_name.
@@ -136,9 +170,9 @@ async def process_agent(request: AgentRequest):
     # Thread ID becomes memory key
     config = {"configurable": {"thread_id": request.thread_id}}
 
-    # Run the LangGraph agent with system context
+    # Run the LangGraph agent; the system context is applied by the agent prompt
+    # so only the new user turn is appended to thread memory
     messages = [
-        ("system", request.context),
         ("user", request.user_message)
     ]
     result = agent.invoke(
@@ -158,6 +192,10 @@ async def process_agent(request: AgentRequest):
     if token_usage:
         logger.info(f"⚡ TOKENS [Thread: {request.thread_id}]: {token_usage}")
 
+    cached_tokens = extract_cached_tokens_from_result(result)
+    if cached_tokens is not None:
+        logger.info(f"💾 CACHED TOKENS [Thread: {request.thread_id}]: {cached_tokens}")
+
     model_name = extract_model_name_from_result(result)
     if model_name:
         logger.info(f"🧠 MODEL [Thread: {request.thread_id}]: {model_name}")
@@ -192,4 +230,5 @@ async def process_agent(request: AgentRequest):
         "conversation_length": conversation_length,
         "model_name": model_name,
         "token_usage": token_usage,
+        "cached_tokens": cached_tokens,
     }
@@ -0,0 +1,98 @@
+"""Offline tests for prompt prefix stability and cached-token reporting.
+
+Uses a recording fake chat model instead of OpenAI, so no network calls are made.
+"""
+import os
+import sys
+import json
+import uuid
+
+# Make parent package importable when running this file directly
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from typing import Any, List
+from pydantic import Field
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.utils.function_calling import convert_to_openai_tool
+
+from agent_builder import build_dynamic_agent, build_prompt_prefix
+from main import extract_cached_tokens_from_result
+from models import ToolSchema
+
+
+class RecordingChatModel(BaseChatModel):
+    """Fake chat model that records the exact messages and tools it is called with."""
+    calls: List[Any] = Field(default_factory=list)
+
+    @property
+    def _llm_type(self) -> str:
+        return "recording"
+
+    def bind_tools(self, tools, **kwargs):
+        return self.bind(tools=[convert_to_openai_tool(t) for t in tools], **kwargs)
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        self.calls.append({
+            "messages": [(m.type, m.content) for m in messages],
+            "tools": json.dumps(kwargs.get("tools", [])),
+        })
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content="ok"))])
+
+
+CONTEXT = "You are a helpful assistant.\r\nAnswer briefly.  \n"
+
+TOOLS = [
+    {"name": "submit_feedback", "description": "Submit user feedback"},
+    {"name": "check_weather", "description": "Get weather information",
+     "endpoint": "https://api.weather.com/current", "method": "GET"},
+    {"name": "request_feedback", "description": "Request feedback"},
+]
+
+
+def make_tools(order):
+    return [ToolSchema(**TOOLS[i]) for i in order]
+
+
+def test_prompt_prefix_is_stable_for_reordered_tools():
+    a = build_prompt_prefix(CONTEXT, make_tools([0, 1, 2]))
+    b = build_prompt_prefix(CONTEXT, make_tools([2, 0, 1]))
+    assert json.dumps(a) == json.dumps(b)
+    assert [t["function"]["name"] for t in a["tools"]] == [
+        "check_weather", "request_feedback", "submit_feedback"]
+    assert a["system"] == "You are a helpful assistant.\nAnswer briefly."
+
+
+def test_prompt_prefix_is_stable_across_turns_and_requests():
+    llm = RecordingChatModel()
+    thread_id = f"prefix_{uuid.uuid4()}"
+    config = {"configurable": {"thread_id": thread_id}}
+
+    # Each turn rebuilds the agent like /agent/process does, with tools in a different order
+    for order, text in (([0, 1, 2], "Hi"), ([2, 1, 0], "Still there?"), ([1, 0, 2], "Bye")):
+        agent = build_dynamic_agent(CONTEXT, make_tools(order), llm=llm)
+        agent.invoke({"messages": [("user", text)]}, config=config)
+
+    assert len(llm.calls) == 3
+    first = llm.calls[0]
+    for call in llm.calls[1:]:
+        # Identical tool definitions and a single leading system message
+        assert call["tools"] == first["tools"]
+        assert call["messages"][0] == first["messages"][0]
+        assert [m for m in call["messages"] if m[0] == "system"] == [first["messages"][0]]
+
+    # Each prompt is a strict prefix of the next one
+    for prev, nxt in zip(llm.calls, llm.calls[1:]):
+        assert nxt["messages"][:len(prev["messages"])] == prev["messages"]
+
+
+def test_extract_cached_tokens_from_result():
+    openai_msg = AIMessage(content="ok", response_metadata={
+        "token_usage": {"prompt_tokens": 2000, "prompt_tokens_details": {"cached_tokens": 1792}}})
+    assert extract_cached_tokens_from_result({"messages": [openai_msg]}) == 1792
+
+    lc_msg = {"usage_metadata": {"input_tokens": 10, "input_token_details": {"cache_read": 0}}}
+    assert extract_cached_tokens_from_result({"messages": [lc_msg]}) == 0
+
+    assert extract_cached_tokens_from_result({"messages": [AIMessage(content="ok")]}) is None